@@ -1,21 +1,155 @@
-import json
+import hashlib
 import os
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+import orjson
+from dataclasses import dataclass
+from email.utils import formatdate
+from functools import lru_cache
+from pathlib import Path
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from ..models.compensation import BenchmarkData
 
 router = APIRouter(prefix="/benchmarks", tags=["benchmarks"])
 
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "benchmarks.json"
 
-def load_benchmark_data() -> List[dict]:
-    """Load benchmark data from JSON file"""
+# Raw contents and mtime of DATA_FILE, kept in memory so re-indexing skips the disk
+_benchmark_file: Optional[Tuple[bytes, float]] = None
+
+
+class _BenchmarkRecord(BenchmarkData):
+    """Benchmark entry as stored in benchmarks.json"""
+    level: str = Field(..., description="Job level")
+
+
+class _BenchmarkFile(BaseModel):
+    """Top-level layout of benchmarks.json"""
+    benchmarks: List[_BenchmarkRecord] = Field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class BenchmarkIndex:
+    """Parsed benchmark data plus values derived from it at load time"""
+    models: Tuple[_BenchmarkRecord, ...]
+    roles: List[str]
+    levels: List[str]
+    locations: List[str]
+    summary: dict
+    by_key: Dict[Tuple[str, str, str], BenchmarkData]
+    role_idx: Dict[str, FrozenSet[int]]
+    level_idx: Dict[str, FrozenSet[int]]
+    location_idx: Dict[str, FrozenSet[int]]
+    roles_json: bytes
+    levels_json: bytes
+    locations_json: bytes
+    summary_json: bytes
+    etag: str
+    last_modified: str
+
+
+def _build_inverted_index(
+    models: Tuple[_BenchmarkRecord, ...], field: str
+) -> Dict[str, FrozenSet[int]]:
+    """Map each value of a field to the positions of the benchmarks holding it"""
+    positions: Dict[str, set] = {}
+    for i, model in enumerate(models):
+        positions.setdefault(getattr(model, field), set()).add(i)
+    return {value: frozenset(idx) for value, idx in positions.items()}
+
+
+def _build_benchmark_index(
+    models: Tuple[_BenchmarkRecord, ...], etag: str, last_modified: str
+) -> BenchmarkIndex:
+    """Precompute distinct values and summary statistics for the benchmarks"""
+    # Collect distinct values and the 50th percentile sums in a single pass
+    role_set, level_set, location_set = set(), set(), set()
+    sum_base_50th = sum_equity_50th = sum_total_50th = 0.0
+    for m in models:
+        role_set.add(m.role)
+        level_set.add(m.level)
+        location_set.add(m.location)
+        sum_base_50th += m.base_salary_50th
+        sum_equity_50th += m.equity_50th
+        sum_total_50th += m.total_comp_50th
+    
+    roles = sorted(role_set)
+    levels = sorted(level_set)
+    locations = sorted(location_set)
+    
+    if not models:
+        summary = {"message": "No benchmark data available"}
+    else:
+        total_benchmarks = len(models)
+        summary = {
+            "total_benchmarks": total_benchmarks,
+            "available_roles": len(roles),
+            "available_levels": len(levels),
+            "available_locations": len(locations),
+            "average_base_salary_50th": round(sum_base_50th / total_benchmarks),
+            "average_equity_50th": round(sum_equity_50th / total_benchmarks),
+            "average_total_comp_50th": round(sum_total_50th / total_benchmarks),
+            "roles": roles,
+            "levels": levels,
+            "locations": locations
+        }
+    
+    # Hash index for role/level/location lookups; the first entry wins on duplicates
+    by_key: Dict[Tuple[str, str, str], BenchmarkData] = {}
+    for m in models:
+        by_key.setdefault((m.role, m.level, m.location), m)
+    
+    return BenchmarkIndex(
+        models=models,
+        roles=roles,
+        levels=levels,
+        locations=locations,
+        summary=summary,
+        by_key=by_key,
+        role_idx=_build_inverted_index(models, "role"),
+        level_idx=_build_inverted_index(models, "level"),
+        location_idx=_build_inverted_index(models, "location"),
+        roles_json=orjson.dumps(roles),
+        levels_json=orjson.dumps(levels),
+        locations_json=orjson.dumps(locations),
+        summary_json=orjson.dumps(summary),
+        etag=etag,
+        last_modified=last_modified
+    )
+
+
+def preload_benchmark_file() -> None:
+    """Read the benchmark file into memory; called at startup and on reload"""
+    global _benchmark_file
+    with DATA_FILE.open("rb") as f:
+        _benchmark_file = (f.read(), os.fstat(f.fileno()).st_mtime)
+
+
+def _benchmark_file_contents() -> Tuple[bytes, float]:
+    """Return the in-memory benchmark file, reading it on first use"""
+    if _benchmark_file is None:
+        preload_benchmark_file()
+    return _benchmark_file
+
+
+@lru_cache(maxsize=1)
+def _load_benchmark_index_cached() -> BenchmarkIndex:
+    """Read, parse and index the benchmark JSON file once per process"""
+    raw, modified_at = _benchmark_file_contents()
+    
+    # Every benchmark response is derived from the file, so its digest is the ETag
+    etag = f'"{hashlib.blake2b(raw, digest_size=8).hexdigest()}"'
+    last_modified = formatdate(modified_at, usegmt=True)
+    
+    # Parse and validate straight from the raw bytes in a single pydantic-core pass
+    data = _BenchmarkFile.model_validate_json(raw)
+    return _build_benchmark_index(tuple(data.benchmarks), etag, last_modified)
+
+
+def load_benchmark_index() -> BenchmarkIndex:
+    """Load the benchmark index, parsing the JSON file only on first use"""
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        data_file = os.path.join(current_dir, "..", "data", "benchmarks.json")
-        
-        with open(data_file, "r") as f:
-            data = json.load(f)
-            return data.get("benchmarks", [])
+        return _load_benchmark_index_cached()
     
     except Exception as e:
         raise HTTPException(
@@ -23,8 +157,60 @@ def load_benchmark_data() -> List[dict]:
         )
 
 
+def load_benchmark_data() -> Tuple[BenchmarkData, ...]:
+    """Load validated benchmark data from the cached index"""
+    return load_benchmark_index().models
+
+
+def reload_benchmarks() -> None:
+    """
+    Drop the cached benchmark index so the next request rebuilds it
+    
+    The file is only read again when its mtime differs from the in-memory
+    copy; otherwise the index is rebuilt from the buffered bytes.
+    """
+    if _benchmark_file is None or DATA_FILE.stat().st_mtime != _benchmark_file[1]:
+        preload_benchmark_file()
+    _load_benchmark_index_cached.cache_clear()
+
+
+def _cache_headers(index: BenchmarkIndex) -> Dict[str, str]:
+    """Validator headers shared by every benchmark response"""
+    return {"ETag": index.etag, "Last-Modified": index.last_modified}
+
+
+def _is_not_modified(request: Request, index: BenchmarkIndex) -> bool:
+    """Check whether the client's If-None-Match already covers the current data"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    # Weak comparison, as required for If-None-Match
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return index.etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def _not_modified_response(index: BenchmarkIndex) -> Response:
+    """Empty 304 response for clients holding the current data"""
+    return Response(status_code=304, headers=_cache_headers(index))
+
+
+def _json_response(content: bytes, index: BenchmarkIndex) -> Response:
+    """Wrap a pre-encoded JSON body with the benchmark cache headers"""
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=_cache_headers(index)
+    )
+
+
 @router.get("/", response_model=List[BenchmarkData])
 async def get_benchmarks(
+    request: Request,
+    response: Response,
     role: Optional[str] = None,
     level: Optional[str] = None,
     location: Optional[str] = None
@@ -41,92 +227,84 @@ async def get_benchmarks(
         List of benchmark data matching the filters
     """
     try:
-        benchmarks = load_benchmark_data()
+        index = load_benchmark_index()
+        if _is_not_modified(request, index):
+            return _not_modified_response(index)
         
-        # Apply filters
-        if role:
-            benchmarks = [b for b in benchmarks if b.get("role") == role]
+        response.headers.update(_cache_headers(index))
         
-        if level:
-            benchmarks = [b for b in benchmarks if b.get("level") == level]
+        # Intersect the inverted indexes of the supplied filters
+        candidates: Optional[FrozenSet[int]] = None
+        for value, field_idx in (
+            (role, index.role_idx),
+            (level, index.level_idx),
+            (location, index.location_idx),
+        ):
+            if value:
+                matches = field_idx.get(value, frozenset())
+                candidates = matches if candidates is None else candidates & matches
         
-        if location:
-            benchmarks = [b for b in benchmarks if b.get("location") == location]
+        if candidates is None:
+            return list(index.models)
         
-        return [BenchmarkData(**benchmark) for benchmark in benchmarks]
+        # Keep the file order of the matching benchmarks
+        return [index.models[i] for i in sorted(candidates)]
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving benchmarks: {str(e)}")
 
 
 @router.get("/roles")
-async def get_available_roles() -> List[str]:
+async def get_available_roles(request: Request) -> List[str]:
     """Get list of available job roles"""
     try:
-        benchmarks = load_benchmark_data()
-        roles = list(set(benchmark.get("role") for benchmark in benchmarks))
-        return sorted(roles)
+        index = load_benchmark_index()
+        if _is_not_modified(request, index):
+            return _not_modified_response(index)
+        
+        return _json_response(index.roles_json, index)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving roles: {str(e)}")
 
 
 @router.get("/levels")
-async def get_available_levels() -> List[str]:
+async def get_available_levels(request: Request) -> List[str]:
     """Get list of available job levels"""
     try:
-        benchmarks = load_benchmark_data()
-        levels = list(set(benchmark.get("level") for benchmark in benchmarks))
-        return sorted(levels)
+        index = load_benchmark_index()
+        if _is_not_modified(request, index):
+            return _not_modified_response(index)
+        
+        return _json_response(index.levels_json, index)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving levels: {str(e)}")
 
 
 @router.get("/locations")
-async def get_available_locations() -> List[str]:
+async def get_available_locations(request: Request) -> List[str]:
     """Get list of available locations"""
     try:
-        benchmarks = load_benchmark_data()
-        locations = list(set(benchmark.get("location") for benchmark in benchmarks))
-        return sorted(locations)
+        index = load_benchmark_index()
+        if _is_not_modified(request, index):
+            return _not_modified_response(index)
+        
+        return _json_response(index.locations_json, index)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving locations: {str(e)}")
 
 
 @router.get("/summary")
-async def get_benchmark_summary() -> dict:
+async def get_benchmark_summary(request: Request) -> dict:
     """Get summary statistics of benchmark data"""
     try:
-        benchmarks = load_benchmark_data()
-        
-        if not benchmarks:
-            return {"message": "No benchmark data available"}
-        
-        # Calculate summary statistics
-        total_benchmarks = len(benchmarks)
-        roles = list(set(benchmark.get("role") for benchmark in benchmarks))
-        levels = list(set(benchmark.get("level") for benchmark in benchmarks))
-        locations = list(set(benchmark.get("location") for benchmark in benchmarks))
+        index = load_benchmark_index()
+        if _is_not_modified(request, index):
+            return _not_modified_response(index)
         
-        # Calculate average compensation ranges
-        avg_base_50th = sum(b.get("base_salary_50th", 0) for b in benchmarks) / len(benchmarks)
-        avg_equity_50th = sum(b.get("equity_50th", 0) for b in benchmarks) / len(benchmarks)
-        avg_total_50th = sum(b.get("total_comp_50th", 0) for b in benchmarks) / len(benchmarks)
-        
-        return {
-            "total_benchmarks": total_benchmarks,
-            "available_roles": len(roles),
-            "available_levels": len(levels),
-            "available_locations": len(locations),
-            "average_base_salary_50th": round(avg_base_50th),
-            "average_equity_50th": round(avg_equity_50th),
-            "average_total_comp_50th": round(avg_total_50th),
-            "roles": roles,
-            "levels": levels,
-            "locations": locations
-        }
+        return _json_response(index.summary_json, index)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
@@ -136,7 +314,9 @@ async def get_benchmark_summary() -> dict:
 async def get_specific_benchmark(
     role: str,
     level: str,
-    location: str
+    location: str,
+    request: Request,
+    response: Response
 ) -> BenchmarkData:
     """
     Get specific benchmark data for role/level/location combination
@@ -150,19 +330,20 @@ async def get_specific_benchmark(
         Benchmark data for the specific combination
     """
     try:
-        benchmarks = load_benchmark_data()
+        index = load_benchmark_index()
+        benchmark = index.by_key.get((role, level, location))
         
-        # Find matching benchmark
-        for benchmark in benchmarks:
-            if (benchmark.get("role") == role and
-                benchmark.get("level") == level and
-                benchmark.get("location") == location):
-                return BenchmarkData(**benchmark)
+        if benchmark is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No benchmark data found for {role} {level} in {location}"
+            )
         
-        raise HTTPException(
-            status_code=404,
-            detail=f"No benchmark data found for {role} {level} in {location}"
-        )
+        if _is_not_modified(request, index):
+            return _not_modified_response(index)
+        
+        response.headers.update(_cache_headers(index))
+        return benchmark
     
     except HTTPException:
         raise
@@ -1,5 +1,12 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from email.message import Message
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import (
+    validation_error_definition,
+    validation_error_response_definition,
+)
+from pydantic import ValidationError
+from typing import List, Optional
 from ..models.compensation import (
     ComparisonRequest,
     ComparisonResponse,
@@ -11,18 +18,130 @@ router = APIRouter(prefix="/compare", tags=["comparison"])
 
 compensation_service = CompensationService()
 
+# Upper bound on the raw /compare request body (10 offers fit comfortably)
+MAX_COMPARE_BODY_BYTES = 256 * 1024
+
+# The body is parsed by the handler, so describe it in the OpenAPI schema by hand;
+# the request model, its nested models and FastAPI's validation error models
+# become components of their own
+_COMPARISON_REQUEST_SCHEMA = ComparisonRequest.model_json_schema(
+    ref_template="#/components/schemas/{model}"
+)
+_COMPARISON_REQUEST_COMPONENTS = {
+    **_COMPARISON_REQUEST_SCHEMA.pop("$defs", {}),
+    "ComparisonRequest": _COMPARISON_REQUEST_SCHEMA,
+    "ValidationError": validation_error_definition,
+    "HTTPValidationError": validation_error_response_definition,
+}
+
+
+def add_comparison_request_components(openapi_schema: dict) -> dict:
+    """Register the hand-described /compare request models as OpenAPI components"""
+    schemas = openapi_schema.setdefault("components", {}).setdefault("schemas", {})
+    for name, schema in _COMPARISON_REQUEST_COMPONENTS.items():
+        schemas.setdefault(name, schema)
+    return openapi_schema
+
+
+async def _read_bounded_body(raw_request: Request, limit: int) -> bytes:
+    """Read the request body, rejecting it with 413 once it exceeds the limit"""
+    content_length = raw_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise HTTPException(status_code=413, detail="Request body too large")
+    
+    body = bytearray()
+    async for chunk in raw_request.stream():
+        body.extend(chunk)
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail="Request body too large")
+    
+    return bytes(body)
+
+
+def _is_json_content_type(content_type: Optional[str]) -> bool:
+    """Accept application/json and application/*+json, as FastAPI body parsing does"""
+    if not content_type:
+        return False
+    
+    message = Message()
+    message["content-type"] = content_type
+    if message.get_content_maintype() != "application":
+        return False
+    
+    subtype = message.get_content_subtype()
+    return subtype == "json" or subtype.endswith("+json")
+
 
-@router.post("/", response_model=ComparisonResponse)
-async def compare_offers(request: ComparisonRequest) -> ComparisonResponse:
+def _parse_comparison_request(
+    body: bytes, content_type: Optional[str]
+) -> ComparisonRequest:
+    """Parse and validate the JSON body in a single pydantic-core pass"""
+    if not _is_json_content_type(content_type):
+        # Non-JSON bodies are never parsed, so form posts cannot reach the handler
+        raise RequestValidationError(
+            [
+                {
+                    "type": "model_attributes_type",
+                    "loc": ("body",),
+                    "msg": "Input should be a valid dictionary or object to extract fields from",
+                    "input": body,
+                }
+            ]
+        )
+    
+    try:
+        return ComparisonRequest.model_validate_json(body)
+    except ValidationError as e:
+        # Match the error layout FastAPI uses for body parameters
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+        )
+
+
+@router.post(
+    "/",
+    response_model=ComparisonResponse,
+    responses={
+        413: {"description": "Request body too large"},
+        422: {
+            "description": "Validation Error",
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/HTTPValidationError"}
+                }
+            }
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/ComparisonRequest"}
+                }
+            },
+            "required": True
+        }
+    }
+)
+async def compare_offers(raw_request: Request) -> Response:
     """
     Compare multiple compensation offers
     
     Args:
-        request: ComparisonRequest with offers and projection years
+        raw_request: Raw request whose body is a ComparisonRequest with
+            offers and projection years
         
     Returns:
         ComparisonResponse with projections for all offers
     """
+    body = await _read_bounded_body(raw_request, MAX_COMPARE_BODY_BYTES)
+    request = _parse_comparison_request(
+        body, raw_request.headers.get("content-type")
+    )
+    
     try:
         if not request.offers:
             raise HTTPException(
@@ -34,12 +153,12 @@ async def compare_offers(request: ComparisonRequest) -> ComparisonResponse:
                 status_code=400, detail="Maximum 10 offers can be compared at once"
             )
         
-        # Generate projections for all offers
-        projections = compensation_service.compare_offers(
+        # Generate and encode projections for all offers off the event loop
+        content = await compensation_service.compare_offers_json(
             request.offers, request.projection_years
         )
         
-        return ComparisonResponse(projections=projections)
+        return Response(content=content, media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error comparing offers: {str(e)}")
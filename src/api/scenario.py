@@ -5,10 +5,12 @@ from ..models.compensation import (
     OfferProjection,
     CompensationOffer,
 )
+from ..services.compensation_service import CompensationService
 from ..services.scenario_service import ScenarioService
 
 router = APIRouter(prefix="/scenario", tags=["scenarios"])
 
+compensation_service = CompensationService()
 scenario_service = ScenarioService()
 
 
@@ -37,9 +39,9 @@ async def run_scenario(request: ScenarioRequest) -> OfferProjection:
         
         else:
             # Return base projection if no scenario parameters
-            from ..services.compensation_service import CompensationService
-            comp_service = CompensationService()
-            return comp_service.compute_total_comp(request.offer, request.projection_years)
+            return compensation_service.compute_total_comp(
+                request.offer, request.projection_years
+            )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error running scenario: {str(e)}")
@@ -3,9 +3,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 
-from .api.compare import router as compare_router
+from .api.compare import router as compare_router, add_comparison_request_components
 from .api.scenario import router as scenario_router
-from .api.benchmarks import router as benchmarks_router
+from .api.benchmarks import router as benchmarks_router, preload_benchmark_file
 
 
 @asynccontextmanager
@@ -13,6 +13,7 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     print("🚀 Starting Compensation Comparison Tool API...")
+    preload_benchmark_file()
     yield
     # Shutdown
     print("👋 Shutting down Compensation Comparison Tool API...")
@@ -42,6 +43,17 @@ app.include_router(compare_router)
 app.include_router(scenario_router)
 app.include_router(benchmarks_router)
 
+# /compare parses its own body, so its request models are added to the schema here
+_default_openapi = app.openapi
+
+
+def custom_openapi() -> dict:
+    """OpenAPI schema including the /compare request components"""
+    return add_comparison_request_components(_default_openapi())
+
+
+app.openapi = custom_openapi
+
 
 @app.get("/")
 async def root():
@@ -1,6 +1,7 @@
 from datetime import date
 from typing import List, Optional, Literal
 from pydantic import BaseModel, Field
+from ..utils.math_helpers import month_ordinal
 
 
 class VestingSchedule(BaseModel):
@@ -25,6 +26,11 @@ class EquityGrant(BaseModel):
         default=0.0, description="Annual growth rate for equity value"
     )
 
+    @property
+    def start_month_ordinal(self) -> int:
+        """Start date as a month ordinal (see month_ordinal)"""
+        return month_ordinal(self.start_date)
+
 
 class CompensationOffer(BaseModel):
     """Complete compensation offer"""
@@ -42,6 +48,11 @@ class CompensationOffer(BaseModel):
     )
     start_date: date = Field(..., description="Employment start date")
 
+    @property
+    def start_month_ordinal(self) -> int:
+        """Start date as a month ordinal (see month_ordinal)"""
+        return month_ordinal(self.start_date)
+
 
 class YearlyProjection(BaseModel):
     """Year-by-year compensation breakdown"""
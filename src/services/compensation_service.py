@@ -1,12 +1,45 @@
+import asyncio
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
 from datetime import date
-from typing import List
+from typing import List, Optional, Tuple
 from ..models.compensation import (
     CompensationOffer,
     YearlyProjection,
     OfferProjection,
 )
-from ..services.equity_projection_service import EquityProjectionService
-from ..utils.math_helpers import calculate_future_value
+from ..services.equity_projection_service import (
+    EquityOverrides,
+    EquityProjectionService,
+    NO_OVERRIDES,
+)
+from ..utils.math_helpers import calculate_future_value, project_cash_compensation
+
+ProjectionComponents = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+SalaryBonus = Tuple[np.ndarray, np.ndarray]
+
+# LRU cache of projection components shared by all service instances
+PROJECTION_CACHE_SIZE = 512
+_projection_cache: "OrderedDict[Tuple[str, int, EquityOverrides], ProjectionComponents]" = OrderedDict()
+_projection_cache_lock = threading.Lock()
+
+
+def _projection_cache_key(
+    offer: CompensationOffer, years: int, overrides: EquityOverrides
+) -> Tuple[str, int, EquityOverrides]:
+    """Build a stable cache key from the offer's canonical JSON form"""
+    digest = hashlib.blake2b(
+        offer.model_dump_json().encode(), digest_size=16
+    ).hexdigest()
+    return digest, years, overrides
+
+
+def clear_projection_cache() -> None:
+    """Drop all cached projection components"""
+    with _projection_cache_lock:
+        _projection_cache.clear()
 
 
 class CompensationService:
@@ -16,7 +49,12 @@ class CompensationService:
         self.equity_service = EquityProjectionService()
     
     def compute_total_comp(
-        self, offer: CompensationOffer, years: int
+        self,
+        offer: CompensationOffer,
+        years: int,
+        growth_rate_override: Optional[float] = None,
+        refresh_rate_override: Optional[float] = None,
+        start_date_offset_days: int = 0
     ) -> OfferProjection:
         """
         Compute total compensation projection for an offer
@@ -24,94 +62,237 @@ class CompensationService:
         Args:
             offer: Compensation offer to analyze
             years: Number of years to project
+            growth_rate_override: Growth rate to use for every equity grant
+            refresh_rate_override: Refresh rate to use for every equity grant
+            start_date_offset_days: Days to shift the offer and grant start dates by
             
         Returns:
             OfferProjection with yearly breakdown
         """
-        yearly_projections = []
+        overrides = EquityOverrides(
+            growth_rate=growth_rate_override,
+            refresh_rate=refresh_rate_override,
+            start_date_offset_days=start_date_offset_days
+        )
+        return self.build_projection(
+            offer.offer_name, *self.project_components(offer, years, overrides)
+        )
+    
+    def compute_salary_bonus_projection(
+        self, offer: CompensationOffer, years: int
+    ) -> SalaryBonus:
+        """
+        Project the non-equity columns of an offer
         
-        for year in range(1, years + 1):
-            projection = self._calculate_year_projection(offer, year)
-            yearly_projections.append(projection)
+        Salary and bonus do not depend on equity or on any scenario
+        adjustment, so callers projecting several scenarios of the same
+        offer can compute them once and reuse them.
         
-        return OfferProjection(
-            offer_name=offer.offer_name,
-            years=yearly_projections
+        Args:
+            offer: Compensation offer to analyze
+            years: Number of years to project
+            
+        Returns:
+            Tuple of (base salary, bonus) arrays indexed by year - 1
+        """
+        return project_cash_compensation(
+            offer.base_salary,
+            offer.signing_bonus,
+            offer.bonus_fixed,
+            offer.bonus_percentage,
+            years
         )
     
-    def _calculate_year_projection(
-        self, offer: CompensationOffer, year: int
-    ) -> YearlyProjection:
-        """Calculate compensation for a specific year"""
-        # Base salary (assumed to be constant for simplicity)
-        base_salary = offer.base_salary
-        
-        # Bonus calculation
-        bonus = self._calculate_bonus(offer, year)
-        
-        # Equity value for the year
-        equity_value = self.equity_service.calculate_year_equity_value(
-            offer, year
+    def compute_equity_projection(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        growth_rate_override: Optional[float] = None,
+        refresh_rate_override: Optional[float] = None,
+        start_date_offset_days: int = 0,
+        include_refresh: bool = True
+    ) -> np.ndarray:
+        """
+        Project the equity column of an offer
+        
+        Args:
+            offer: Compensation offer to analyze
+            years: Number of years to project
+            growth_rate_override: Growth rate to use for every equity grant
+            refresh_rate_override: Refresh rate to use for every equity grant
+            start_date_offset_days: Days to shift the offer and grant start dates by
+            include_refresh: Whether to include refresh grants
+            
+        Returns:
+            Read-only array of equity values indexed by year - 1
+        """
+        overrides = EquityOverrides(
+            growth_rate=growth_rate_override,
+            refresh_rate=refresh_rate_override,
+            start_date_offset_days=start_date_offset_days,
+            include_refresh=include_refresh
         )
+        return self.project_components(offer, years, overrides)[2]
+    
+    def build_projection(
+        self,
+        offer_name: str,
+        base: np.ndarray,
+        bonus: np.ndarray,
+        equity: np.ndarray,
+        total: np.ndarray
+    ) -> OfferProjection:
+        """
+        Convert per-year component arrays into an OfferProjection
         
-        # Total compensation
-        total = base_salary + bonus + equity_value
+        The models are built with model_construct, skipping validation: the
+        arrays are derived from already validated offers, and callers must
+        only pass finite, non-negative values.
+        """
+        yearly_projections = [
+            YearlyProjection.model_construct(
+                year=year,
+                base_salary=float(base_salary),
+                bonus=float(year_bonus),
+                equity_value=float(equity_value),
+                total=float(year_total)
+            )
+            for year, (base_salary, year_bonus, equity_value, year_total) in enumerate(
+                zip(base, bonus, equity, total), start=1
+            )
+        ]
         
-        return YearlyProjection(
-            year=year,
-            base_salary=base_salary,
-            bonus=bonus,
-            equity_value=equity_value,
-            total=total
+        return OfferProjection.model_construct(
+            offer_name=offer_name,
+            years=yearly_projections
         )
     
-    def _calculate_bonus(self, offer: CompensationOffer, year: int) -> float:
-        """Calculate bonus for a specific year"""
-        # Signing bonus only in first year
-        if year == 1:
-            return offer.signing_bonus + offer.bonus_fixed + (
-                offer.base_salary * offer.bonus_percentage / 100
-            )
-        else:
-            return offer.bonus_fixed + (
-                offer.base_salary * offer.bonus_percentage / 100
+    def project_components(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        overrides: EquityOverrides = NO_OVERRIDES
+    ) -> ProjectionComponents:
+        """Return base, bonus, equity and total arrays, reusing cached results"""
+        key = _projection_cache_key(offer, years, overrides)
+        
+        with _projection_cache_lock:
+            components = _projection_cache.get(key)
+            if components is not None:
+                _projection_cache.move_to_end(key)
+                return components
+        
+        components = self._compute_components(offer, years, overrides)
+        
+        # Cached arrays are shared between callers, so freeze them
+        for array in components:
+            array.flags.writeable = False
+        
+        with _projection_cache_lock:
+            _projection_cache[key] = components
+            _projection_cache.move_to_end(key)
+            if len(_projection_cache) > PROJECTION_CACHE_SIZE:
+                _projection_cache.popitem(last=False)
+        
+        return components
+    
+    def _compute_components(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        overrides: EquityOverrides
+    ) -> ProjectionComponents:
+        """Compute base, bonus, equity and total arrays indexed by year - 1"""
+        equity = self.equity_service.year_equity_vector(offer, years, overrides)
+        
+        base, bonus = self.compute_salary_bonus_projection(offer, years)
+        total = base + bonus + equity
+        
+        return base, bonus, equity, total
+    
+    def _resolve_components(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        projection: Optional[OfferProjection]
+    ) -> ProjectionComponents:
+        """Use an already computed projection when given, otherwise project the offer"""
+        if projection is None:
+            return self.project_components(offer, years)
+        
+        rows = projection.years
+        if len(rows) != max(years, 0):
+            raise ValueError(
+                f"Projection covers {len(rows)} years, expected {max(years, 0)}"
             )
+        
+        return (
+            np.array([row.base_salary for row in rows], dtype=np.float64),
+            np.array([row.bonus for row in rows], dtype=np.float64),
+            np.array([row.equity_value for row in rows], dtype=np.float64),
+            np.array([row.total for row in rows], dtype=np.float64),
+        )
     
-    def compare_offers(
+    def compute_total_comp_json(self, offer: CompensationOffer, years: int) -> bytes:
+        """Compute an offer projection and serialize it to JSON"""
+        return self.compute_total_comp(offer, years).model_dump_json().encode()
+    
+    async def compare_offers_json(
         self, offers: List[CompensationOffer], years: int
-    ) -> List[OfferProjection]:
-        """Compare multiple offers"""
-        return [self.compute_total_comp(offer, years) for offer in offers]
+    ) -> bytes:
+        """
+        Compare multiple offers and return a serialized ComparisonResponse
+        
+        Each projection is computed and encoded in its own worker thread, so
+        only the final byte concatenation runs on the event loop.
+        """
+        encoded = await asyncio.gather(*(
+            asyncio.to_thread(self.compute_total_comp_json, offer, years)
+            for offer in offers
+        ))
+        return b'{"projections":[' + b",".join(encoded) + b"]}"
     
-    def calculate_cagr(self, offer: CompensationOffer, years: int) -> float:
+    def calculate_cagr(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        projection: Optional[OfferProjection] = None
+    ) -> float:
         """Calculate CAGR for an offer over specified years"""
-        projection = self.compute_total_comp(offer, years)
-        
         if years < 2:
             return 0.0
         
-        initial_value = projection.years[0].total
-        final_value = projection.years[-1].total
+        _, _, _, total = self._resolve_components(offer, years, projection)
+        initial_value = float(total[0])
+        final_value = float(total[-1])
         
         if initial_value <= 0:
             return 0.0
         
         return (final_value / initial_value) ** (1 / (years - 1)) - 1
     
-    def calculate_total_value(self, offer: CompensationOffer, years: int) -> float:
+    def calculate_total_value(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        projection: Optional[OfferProjection] = None
+    ) -> float:
         """Calculate total compensation value over specified years"""
-        projection = self.compute_total_comp(offer, years)
-        return sum(year.total for year in projection.years)
+        _, _, _, total = self._resolve_components(offer, years, projection)
+        return float(total.sum())
     
     def calculate_breakdown_percentages(
-        self, offer: CompensationOffer, years: int
+        self,
+        offer: CompensationOffer,
+        years: int,
+        projection: Optional[OfferProjection] = None
     ) -> dict:
         """Calculate percentage breakdown of compensation components"""
-        projection = self.compute_total_comp(offer, years)
+        base, bonus, equity, _ = self._resolve_components(offer, years, projection)
         
-        total_base = sum(year.base_salary for year in projection.years)
-        total_bonus = sum(year.bonus for year in projection.years)
-        total_equity = sum(year.equity_value for year in projection.years)
+        total_base = float(base.sum())
+        total_bonus = float(bonus.sum())
+        total_equity = float(equity.sum())
         total_comp = total_base + total_bonus + total_equity
         
         if total_comp == 0:
@@ -121,4 +302,4 @@ class CompensationService:
             "base": (total_base / total_comp) * 100,
             "bonus": (total_bonus / total_comp) * 100,
             "equity": (total_equity / total_comp) * 100
-        } 
\ No newline at end of file
+        }
@@ -1,14 +1,67 @@
+import numpy as np
 from datetime import date, timedelta
-from typing import List, Optional
-from ..models.compensation import CompensationOffer, EquityGrant
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple, Union
+from ..models.compensation import CompensationOffer, EquityGrant, VestingSchedule
 from ..utils.math_helpers import (
-    calculate_vested_amount,
-    calculate_refresh_grant,
-    calculate_future_value,
+    FREQUENCY_MONTHS,
+    growth_table,
+    shifted_month_ordinal,
     months_between_dates,
 )
 
 
+class EquityOverrides(NamedTuple):
+    """Scenario adjustments applied to every equity grant at projection time"""
+    growth_rate: Optional[float] = None
+    refresh_rate: Optional[float] = None
+    start_date_offset_days: int = 0
+    include_refresh: bool = True
+
+
+NO_OVERRIDES = EquityOverrides()
+
+# Equity from the original grants only, as used by exit scenarios
+VESTING_ONLY = EquityOverrides(include_refresh=False)
+
+
+class VestingScheduleColumns(NamedTuple):
+    """Vesting schedule of a grant stored as one column per field"""
+    year: np.ndarray
+    date: Tuple[date, ...]
+    vesting_percentage: np.ndarray
+    vested_value: np.ndarray
+    months_since_grant: np.ndarray
+    
+    def to_dicts(self) -> List[dict]:
+        """Expand the columns into one dict per year"""
+        return [
+            {
+                "year": year,
+                "date": year_date,
+                "vesting_percentage": vesting_percentage,
+                "vested_value": vested_value,
+                "months_since_grant": months_since_grant
+            }
+            for year, year_date, vesting_percentage, vested_value, months_since_grant in zip(
+                self.year.tolist(),
+                self.date,
+                self.vesting_percentage.tolist(),
+                self.vested_value.tolist(),
+                self.months_since_grant.tolist()
+            )
+        ]
+
+
+@lru_cache(maxsize=1024)
+def _year_dates(start_date: date, years: int) -> Tuple[date, ...]:
+    """Anniversary dates of start_date for years 1..years, shared across calls"""
+    return tuple(
+        start_date.replace(year=start_date.year + year - 1)
+        for year in range(1, years + 1)
+    )
+
+
 class EquityProjectionService:
     """Service for calculating equity projections and vesting schedules"""
     
@@ -25,72 +78,170 @@ class EquityProjectionService:
         Returns:
             Total equity value for the year
         """
-        # Calculate the date for this year
-        year_date = self._get_year_date(offer.start_date, year)
+        return float(self.year_equity_vector(offer, year)[year - 1])
+    
+    def year_equity_vector(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        overrides: EquityOverrides = NO_OVERRIDES
+    ) -> np.ndarray:
+        """
+        Calculate total equity value for every projected year at once
+        
+        Args:
+            offer: Compensation offer
+            years: Number of years to project
+            overrides: Growth rate, refresh rate and start date shift applied
+                to every grant instead of the offer's own values, and whether
+                to include refresh grants
+            
+        Returns:
+            Array of equity values indexed by year - 1
+        """
+        years = max(years, 0)
+        year_numbers = np.arange(1, years + 1)
+        total_equity = np.zeros(years, dtype=np.float64)
         
-        total_equity_value = 0.0
+        # Shifting the start date moves the offer and every grant by the same offset
+        offset_days = overrides.start_date_offset_days
+        start_month = self._start_month(offer, offset_days)
         
         # Calculate equity from each grant
         for grant in offer.equity_grants:
-            grant_value = self._calculate_grant_value_for_year(grant, year_date, year)
-            total_equity_value += grant_value
+            growth_rate = (
+                grant.growth_rate if overrides.growth_rate is None else overrides.growth_rate
+            )
+            refresh_rate = (
+                grant.refresh_rate if overrides.refresh_rate is None else overrides.refresh_rate
+            )
+            months, growth = self._grant_timeline(
+                self._start_month(grant, offset_days), start_month, years, growth_rate
+            )
+            grant_equity = self._vesting_curve(grant, months, growth)
+            if overrides.include_refresh:
+                grant_equity = grant_equity + self._refresh_curve(
+                    grant, year_numbers, refresh_rate, growth
+                )
+            total_equity += grant_equity
         
-        return total_equity_value
+        return total_equity
     
-    def _calculate_grant_value_for_year(
-        self, grant: EquityGrant, year_date: date, year: int
-    ) -> float:
-        """Calculate equity value for a specific grant in a given year"""
-        # Calculate vested amount for this grant
-        vested_value = calculate_vested_amount(
-            total_grant_value=grant.value,
-            grant_start_date=grant.start_date,
-            vesting_start_date=grant.start_date,
-            cliff_months=grant.vesting_schedule.cliff_months,
-            duration_months=grant.vesting_schedule.duration_months,
-            frequency=grant.vesting_schedule.frequency,
-            current_date=year_date,
-            growth_rate=grant.growth_rate
-        )
+    def scenario_equity_matrix(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        scenario_overrides: List[EquityOverrides],
+        exit_multipliers: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate equity values for several scenarios of one offer at once
+        
+        Args:
+            offer: Compensation offer
+            years: Number of years to project
+            scenario_overrides: Overrides applied to the offer per scenario
+            exit_multipliers: Multiplier on equity per scenario and year
+            
+        Returns:
+            Array of equity values with shape (n_scenarios, years)
+        """
+        years = max(years, 0)
+        total_equity = np.empty((len(scenario_overrides), years), dtype=np.float64)
         
-        # Calculate refresh grants if applicable
-        refresh_value = self._calculate_refresh_grants(grant, year_date, year)
+        # Each row is the single-scenario projection, so both paths share the math
+        for row, overrides in enumerate(scenario_overrides):
+            total_equity[row] = self.year_equity_vector(offer, years, overrides)
         
-        return vested_value + refresh_value
+        return total_equity * exit_multipliers
     
-    def _calculate_refresh_grants(
-        self, grant: EquityGrant, year_date: date, year: int
-    ) -> float:
-        """Calculate refresh grant values for a given year"""
-        if not grant.refresh_rate or grant.refresh_rate <= 0:
-            return 0.0
-        
-        # Refresh grants typically start after year 1
-        if year <= 1:
-            return 0.0
-        
-        # Calculate years since original grant
-        years_since_grant = months_between_dates(grant.start_date, year_date) / 12
-        
-        # Refresh grants are typically annual
-        refresh_value = calculate_refresh_grant(
-            original_grant_value=grant.value,
-            refresh_rate=grant.refresh_rate,
-            years_since_original=years_since_grant
+    def _start_month(
+        self, item: Union[CompensationOffer, EquityGrant], offset_days: int
+    ) -> int:
+        """Month ordinal of an offer or grant start date shifted by offset_days"""
+        if not offset_days:
+            return item.start_month_ordinal
+        return shifted_month_ordinal(item.start_date, offset_days)
+    
+    def _grant_timeline(
+        self, grant_start_month: int, start_month: int, years: int, growth_rate: float
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Months since grant start and growth multipliers at each anniversary date"""
+        offset_months = months_between_dates(grant_start_month, start_month)
+        months = offset_months + 12 * np.arange(years)
+        growth = growth_table(growth_rate, offset_months, years) if growth_rate > 0 else None
+        return months, growth
+    
+    def _vesting_fraction_curve(
+        self, schedule: VestingSchedule, months: np.ndarray
+    ) -> np.ndarray:
+        """Fraction vested after each number of months, ignoring the cliff"""
+        vesting_percentage = np.minimum(months / schedule.duration_months, 1.0)
+        
+        # Round down to whole vesting periods
+        frequency_months = FREQUENCY_MONTHS.get(schedule.frequency, 1)
+        if frequency_months > 1:
+            periods = schedule.duration_months / frequency_months
+            vesting_percentage = np.floor(vesting_percentage * periods) / periods
+        
+        return vesting_percentage
+    
+    def _vesting_curve(
+        self, grant: EquityGrant, months: np.ndarray, growth: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Vested value of a grant at each yearly anniversary since its start"""
+        vested_value = np.zeros(len(months), dtype=np.float64)
+        
+        # Months grow by 12 per year, so the years before the first one past
+        # the cliff vest nothing and are skipped
+        first_vesting = int(np.searchsorted(months, grant.vesting_schedule.cliff_months))
+        if first_vesting < len(months):
+            vested_value[first_vesting:] = self._vesting_values(
+                grant,
+                months[first_vesting:],
+                None if growth is None else growth[first_vesting:]
+            )
+        
+        return vested_value
+    
+    def _vesting_values(
+        self, grant: EquityGrant, months: np.ndarray, growth: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Vested value of a grant after each number of months since its start"""
+        schedule = grant.vesting_schedule
+        vested_value = grant.value * self._vesting_fraction_curve(schedule, months)
+        
+        # Apply growth rate if specified
+        if growth is not None:
+            vested_value = vested_value * growth
+        
+        # Nothing vests before the cliff
+        return np.where(
+            months < schedule.cliff_months, 0.0, np.maximum(vested_value, 0.0)
+        )
+    
+    def _refresh_curve(
+        self,
+        grant: EquityGrant,
+        year_numbers: np.ndarray,
+        refresh_rate: Optional[float],
+        growth: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Refresh grant value of a grant for each projected year"""
+        if not refresh_rate or refresh_rate <= 0:
+            return np.zeros(len(year_numbers), dtype=np.float64)
+        
+        # Refresh grants are annual and start after year 1
+        refresh_value = np.where(
+            year_numbers > 1, grant.value * (refresh_rate / 100.0), 0.0
         )
         
         # Apply growth rate to refresh grants
-        if grant.growth_rate > 0:
-            refresh_value = calculate_future_value(
-                refresh_value, grant.growth_rate, years_since_grant
-            )
+        if growth is not None:
+            refresh_value = refresh_value * growth
         
         return refresh_value
     
-    def _get_year_date(self, start_date: date, year: int) -> date:
-        """Get the date for a specific year relative to start date"""
-        return start_date.replace(year=start_date.year + year - 1)
-    
     def model_equity_growth(
         self,
         grant: EquityGrant,
@@ -110,37 +261,22 @@ class EquityProjectionService:
         Returns:
             List of equity values for each year
         """
-        yearly_values = []
+        months, growth = self._grant_timeline(
+            grant.start_month_ordinal, grant.start_month_ordinal, years, growth_rate
+        )
+        yearly_values = self._vesting_curve(grant, months, growth)
         
-        for year in range(1, years + 1):
-            year_date = self._get_year_date(grant.start_date, year)
-            
-            # Calculate base vested value
-            vested_value = calculate_vested_amount(
-                total_grant_value=grant.value,
-                grant_start_date=grant.start_date,
-                vesting_start_date=grant.start_date,
-                cliff_months=grant.vesting_schedule.cliff_months,
-                duration_months=grant.vesting_schedule.duration_months,
-                frequency=grant.vesting_schedule.frequency,
-                current_date=year_date,
-                growth_rate=growth_rate
-            )
-            
-            # Apply exit valuation if provided
-            if exit_valuation:
-                # Assume exit valuation affects the final equity value
-                # This is a simplified model
-                if year == years:  # Last year
-                    vested_value *= (exit_valuation / 1000000000)  # Normalize to $1B valuation
-            
-            yearly_values.append(vested_value)
+        # Apply exit valuation if provided
+        if exit_valuation and years > 0:
+            # Assume exit valuation affects the final equity value
+            # This is a simplified model
+            yearly_values[-1] *= (exit_valuation / 1000000000)  # Normalize to $1B valuation
         
-        return yearly_values
+        return yearly_values.tolist()
     
     def calculate_vesting_schedule(
         self, grant: EquityGrant, years: int
-    ) -> List[dict]:
+    ) -> VestingScheduleColumns:
         """
         Calculate detailed vesting schedule
         
@@ -149,47 +285,46 @@ class EquityProjectionService:
             years: Number of years to project
             
         Returns:
-            List of vesting details for each year
+            Vesting details as columns indexed by year - 1; use to_dicts()
+            for one dict per year
         """
-        schedule = []
+        vesting = grant.vesting_schedule
         
-        for year in range(1, years + 1):
-            year_date = self._get_year_date(grant.start_date, year)
-            
-            # Calculate vesting percentage
-            months_since_vesting = months_between_dates(grant.start_date, year_date)
-            
-            if months_since_vesting < grant.vesting_schedule.cliff_months:
-                vesting_percentage = 0.0
-            elif months_since_vesting >= grant.vesting_schedule.duration_months:
-                vesting_percentage = 1.0
-            else:
-                vesting_percentage = months_since_vesting / grant.vesting_schedule.duration_months
-            
-            # Apply frequency adjustments
-            if grant.vesting_schedule.frequency == "quarterly":
-                quarters_vested = int(vesting_percentage * (grant.vesting_schedule.duration_months / 3))
-                vesting_percentage = quarters_vested / (grant.vesting_schedule.duration_months / 3)
-            elif grant.vesting_schedule.frequency == "annually":
-                years_vested = int(vesting_percentage * (grant.vesting_schedule.duration_months / 12))
-                vesting_percentage = years_vested / (grant.vesting_schedule.duration_months / 12)
-            
-            schedule.append({
-                "year": year,
-                "date": year_date,
-                "vesting_percentage": vesting_percentage,
-                "vested_value": grant.value * vesting_percentage,
-                "months_since_grant": months_since_vesting
-            })
+        # Anniversaries keep the grant's month, so they are whole years apart
+        months_since_grant = 12 * np.arange(years)
+        vesting_percentage = np.where(
+            months_since_grant < vesting.cliff_months,
+            0.0,
+            self._vesting_fraction_curve(vesting, months_since_grant)
+        )
         
-        return schedule
+        return VestingScheduleColumns(
+            year=np.arange(1, years + 1),
+            date=_year_dates(grant.start_date, years),
+            vesting_percentage=vesting_percentage,
+            vested_value=grant.value * vesting_percentage,
+            months_since_grant=months_since_grant
+        )
+    
+    def exit_multipliers(
+        self, exit_valuation: float, exit_year: int, years: int
+    ) -> np.ndarray:
+        """Multiplier on vested equity for each year of an exit scenario"""
+        # Simplified exit calculation applied at or after the exit year
+        # In reality, this would depend on the specific terms of the equity
+        return np.where(
+            np.arange(1, years + 1) >= exit_year,
+            exit_valuation / 1000000000,  # Normalize to $1B
+            1.0
+        )
     
     def simulate_exit_scenario(
         self,
         offer: CompensationOffer,
         exit_valuation: float,
         exit_year: int,
-        years: int
+        years: int,
+        vested_equity: Optional[np.ndarray] = None
     ) -> List[float]:
         """
         Simulate equity value with exit scenario
@@ -199,39 +334,12 @@ class EquityProjectionService:
             exit_valuation: Exit valuation in USD
             exit_year: Year of exit
             years: Total years to project
+            vested_equity: Already projected vesting-only equity to rescale
             
         Returns:
             List of equity values for each year
         """
-        yearly_equity = []
-        
-        for year in range(1, years + 1):
-            year_date = self._get_year_date(offer.start_date, year)
-            
-            total_equity = 0.0
-            
-            for grant in offer.equity_grants:
-                # Calculate base vested value
-                vested_value = calculate_vested_amount(
-                    total_grant_value=grant.value,
-                    grant_start_date=grant.start_date,
-                    vesting_start_date=grant.start_date,
-                    cliff_months=grant.vesting_schedule.cliff_months,
-                    duration_months=grant.vesting_schedule.duration_months,
-                    frequency=grant.vesting_schedule.frequency,
-                    current_date=year_date,
-                    growth_rate=grant.growth_rate
-                )
-                
-                # Apply exit multiplier if we're at or after exit year
-                if year >= exit_year:
-                    # Simplified exit calculation
-                    # In reality, this would depend on the specific terms of the equity
-                    exit_multiplier = exit_valuation / 1000000000  # Normalize to $1B
-                    vested_value *= exit_multiplier
-                
-                total_equity += vested_value
-            
-            yearly_equity.append(total_equity)
+        if vested_equity is None:
+            vested_equity = self.year_equity_vector(offer, years, VESTING_ONLY)
         
-        return yearly_equity 
\ No newline at end of file
+        return (vested_equity * self.exit_multipliers(exit_valuation, exit_year, years)).tolist()
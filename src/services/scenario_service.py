@@ -1,15 +1,81 @@
-from datetime import date, timedelta
+import numpy as np
+from dataclasses import dataclass
+from datetime import date
 from typing import List, Optional
 from ..models.compensation import (
     CompensationOffer,
     OfferProjection,
-    YearlyProjection,
 )
 from ..services.compensation_service import CompensationService
-from ..services.equity_projection_service import EquityProjectionService
+from ..services.equity_projection_service import (
+    EquityOverrides,
+    EquityProjectionService,
+    NO_OVERRIDES,
+    VESTING_ONLY,
+)
 from ..utils.math_helpers import months_between_dates
 
 
+def _check_non_negative_equity(equity: np.ndarray) -> None:
+    """
+    Reject equity values that projection models would fail to validate
+    
+    Projections are built without validation, so a negative exit valuation
+    that actually lands in the projected years is rejected here instead.
+    """
+    if (equity < 0).any():
+        raise ValueError("Exit scenario produced negative equity values")
+
+
+def _yearly_totals(projection: OfferProjection) -> np.ndarray:
+    """Yearly totals of a projection as an array"""
+    return np.fromiter(
+        (year.total for year in projection.years),
+        dtype=np.float64,
+        count=len(projection.years)
+    )
+
+
+@dataclass
+class ScenarioImpact:
+    """Impact of a scenario compared to its base projection"""
+    __slots__ = (
+        "total_difference",
+        "percentage_change",
+        "years",
+        "yearly_differences",
+        "yearly_pct_change",
+        "scenario_name",
+    )
+    
+    total_difference: float
+    percentage_change: float
+    years: np.ndarray
+    yearly_differences: np.ndarray
+    yearly_pct_change: np.ndarray
+    scenario_name: str
+    
+    def to_dict(self) -> dict:
+        """Dictionary form with one entry per year of yearly differences"""
+        return {
+            "total_difference": self.total_difference,
+            "percentage_change": self.percentage_change,
+            "yearly_differences": [
+                {
+                    "year": year,
+                    "difference": difference,
+                    "percentage_change": percentage
+                }
+                for year, difference, percentage in zip(
+                    self.years.tolist(),
+                    self.yearly_differences.tolist(),
+                    self.yearly_pct_change.tolist()
+                )
+            ],
+            "scenario_name": self.scenario_name
+        }
+
+
 class ScenarioService:
     """Service for running what-if scenarios"""
     
@@ -34,17 +100,15 @@ class ScenarioService:
         Returns:
             OfferProjection with adjusted dates
         """
-        # Create a new offer with the adjusted start date
-        adjusted_offer = offer.model_copy(deep=True)
-        adjusted_offer.start_date = new_start_date
-        
-        # Adjust all equity grant start dates by the same offset
+        # Shift the offer and all equity grant start dates by the same offset
         date_offset = (new_start_date - offer.start_date).days
         
-        for grant in adjusted_offer.equity_grants:
-            grant.start_date = grant.start_date + timedelta(days=date_offset)
-        
-        return self.compensation_service.compute_total_comp(adjusted_offer, years)
+        equity = self.compensation_service.compute_equity_projection(
+            offer, years, start_date_offset_days=date_offset
+        )
+        return self._scenario_projection(
+            offer, years, offer.offer_name, equity
+        )
     
     def simulate_exit(
         self,
@@ -65,29 +129,18 @@ class ScenarioService:
         Returns:
             OfferProjection with exit-adjusted equity values
         """
-        # Get base compensation projection
-        base_projection = self.compensation_service.compute_total_comp(offer, years)
-        
-        # Calculate exit-adjusted equity values
-        exit_equity_values = self.equity_service.simulate_exit_scenario(
-            offer, exit_valuation, exit_year, years
+        # Exit scenarios rescale the vesting-only equity projection, which is
+        # cached, so scenarios that differ only in exit terms project it once
+        vested_equity = self.compensation_service.compute_equity_projection(
+            offer, years, include_refresh=False
+        )
+        exit_equity = vested_equity * self.equity_service.exit_multipliers(
+            exit_valuation, exit_year, years
         )
+        _check_non_negative_equity(exit_equity)
         
-        # Create new projection with exit-adjusted equity
-        adjusted_years = []
-        for i, year_projection in enumerate(base_projection.years):
-            adjusted_year = YearlyProjection(
-                year=year_projection.year,
-                base_salary=year_projection.base_salary,
-                bonus=year_projection.bonus,
-                equity_value=exit_equity_values[i],
-                total=year_projection.base_salary + year_projection.bonus + exit_equity_values[i]
-            )
-            adjusted_years.append(adjusted_year)
-        
-        return OfferProjection(
-            offer_name=f"{offer.offer_name} (Exit Scenario)",
-            years=adjusted_years
+        return self._scenario_projection(
+            offer, years, f"{offer.offer_name} (Exit Scenario)", exit_equity
         )
     
     def simulate_growth_rate_change(
@@ -107,13 +160,13 @@ class ScenarioService:
         Returns:
             OfferProjection with adjusted growth rate
         """
-        # Create a new offer with adjusted growth rates
-        adjusted_offer = offer.model_copy(deep=True)
-        
-        for grant in adjusted_offer.equity_grants:
-            grant.growth_rate = new_growth_rate
-        
-        return self.compensation_service.compute_total_comp(adjusted_offer, years)
+        # Apply the new growth rate to every grant at projection time
+        equity = self.compensation_service.compute_equity_projection(
+            offer, years, growth_rate_override=new_growth_rate
+        )
+        return self._scenario_projection(
+            offer, years, offer.offer_name, equity
+        )
     
     def simulate_refresh_rate_change(
         self,
@@ -132,13 +185,29 @@ class ScenarioService:
         Returns:
             OfferProjection with adjusted refresh rate
         """
-        # Create a new offer with adjusted refresh rates
-        adjusted_offer = offer.model_copy(deep=True)
-        
-        for grant in adjusted_offer.equity_grants:
-            grant.refresh_rate = new_refresh_rate
+        # Apply the new refresh rate to every grant at projection time
+        equity = self.compensation_service.compute_equity_projection(
+            offer, years, refresh_rate_override=new_refresh_rate
+        )
+        return self._scenario_projection(
+            offer, years, offer.offer_name, equity
+        )
+    
+    def _scenario_projection(
+        self,
+        offer: CompensationOffer,
+        years: int,
+        offer_name: str,
+        equity: np.ndarray
+    ) -> OfferProjection:
+        """Combine scenario equity with the offer's salary and bonus columns"""
+        base, bonus = self.compensation_service.compute_salary_bonus_projection(
+            offer, years
+        )
         
-        return self.compensation_service.compute_total_comp(adjusted_offer, years)
+        return self.compensation_service.build_projection(
+            offer_name, base, bonus, equity, base + bonus + equity
+        )
     
     def compare_scenarios(
         self,
@@ -149,6 +218,10 @@ class ScenarioService:
         """
         Compare multiple scenarios against a base offer
         
+        Scenario parameters are collected per row so every scenario's
+        equity is projected in one (n_scenarios, years) matrix. Incomplete
+        or unknown scenario configurations are skipped.
+        
         Args:
             base_offer: Base compensation offer
             scenarios: List of scenario configurations
@@ -157,60 +230,85 @@ class ScenarioService:
         Returns:
             List of projections for each scenario
         """
-        projections = []
+        # A non-positive horizon projects no years
+        years = max(years, 0)
         
-        # Add base projection
-        base_projection = self.compensation_service.compute_total_comp(base_offer, years)
-        projections.append(base_projection)
+        # Row 0 is the unmodified base offer
+        names = [base_offer.offer_name]
+        scenario_overrides = [NO_OVERRIDES]
+        exit_multipliers = [np.ones(years)]
         
-        # Generate projections for each scenario
         for i, scenario in enumerate(scenarios):
             scenario_type = scenario.get("type")
+            overrides = NO_OVERRIDES
+            exit_multiplier = np.ones(years)
             
             if scenario_type == "start_date":
                 new_start_date = scenario.get("new_start_date")
-                if new_start_date:
-                    projection = self.simulate_start_date_offset(
-                        base_offer, new_start_date, years
-                    )
-                    projection.offer_name = f"Scenario {i+1}: Start Date Change"
-                    projections.append(projection)
+                if not new_start_date:
+                    continue
+                overrides = EquityOverrides(
+                    start_date_offset_days=(new_start_date - base_offer.start_date).days
+                )
+                name = f"Scenario {i+1}: Start Date Change"
             
             elif scenario_type == "exit":
                 exit_valuation = scenario.get("exit_valuation")
                 exit_year = scenario.get("exit_year", 4)
-                if exit_valuation:
-                    projection = self.simulate_exit(
-                        base_offer, exit_valuation, exit_year, years
-                    )
-                    projection.offer_name = f"Scenario {i+1}: Exit at ${exit_valuation/1e9:.1f}B"
-                    projections.append(projection)
+                if not exit_valuation:
+                    continue
+                # The exit path projects vesting only, without refresh grants
+                overrides = VESTING_ONLY
+                exit_multiplier = self.equity_service.exit_multipliers(
+                    exit_valuation, exit_year, years
+                )
+                name = f"Scenario {i+1}: Exit at ${exit_valuation/1e9:.1f}B"
             
             elif scenario_type == "growth_rate":
-                new_growth_rate = scenario.get("growth_rate")
-                if new_growth_rate is not None:
-                    projection = self.simulate_growth_rate_change(
-                        base_offer, new_growth_rate, years
-                    )
-                    projection.offer_name = f"Scenario {i+1}: {new_growth_rate*100:.0f}% Growth"
-                    projections.append(projection)
+                growth_rate = scenario.get("growth_rate")
+                if growth_rate is None:
+                    continue
+                overrides = EquityOverrides(growth_rate=growth_rate)
+                name = f"Scenario {i+1}: {growth_rate*100:.0f}% Growth"
             
             elif scenario_type == "refresh_rate":
-                new_refresh_rate = scenario.get("refresh_rate")
-                if new_refresh_rate is not None:
-                    projection = self.simulate_refresh_rate_change(
-                        base_offer, new_refresh_rate, years
-                    )
-                    projection.offer_name = f"Scenario {i+1}: {new_refresh_rate}% Refresh"
-                    projections.append(projection)
-        
-        return projections
+                refresh_rate = scenario.get("refresh_rate")
+                if refresh_rate is None:
+                    continue
+                overrides = EquityOverrides(refresh_rate=refresh_rate)
+                name = f"Scenario {i+1}: {refresh_rate}% Refresh"
+            
+            else:
+                continue
+            
+            names.append(name)
+            scenario_overrides.append(overrides)
+            exit_multipliers.append(exit_multiplier)
+        
+        equity = self.equity_service.scenario_equity_matrix(
+            base_offer,
+            years,
+            scenario_overrides,
+            np.array(exit_multipliers, dtype=np.float64)
+        )
+        _check_non_negative_equity(equity)
+        
+        # Salary and bonus do not depend on any scenario parameter
+        base, bonus = self.compensation_service.compute_salary_bonus_projection(
+            base_offer, years
+        )
+        totals = base + bonus + equity
+        
+        return [
+            self.compensation_service.build_projection(name, base, bonus, equity[row], totals[row])
+            for row, name in enumerate(names)
+        ]
     
     def calculate_scenario_impact(
         self,
         base_projection: OfferProjection,
         scenario_projection: OfferProjection
-    ) -> dict:
+    ) -> ScenarioImpact:
         """
         Calculate the impact of a scenario compared to base
         
@@ -219,28 +317,30 @@ class ScenarioService:
             scenario_projection: Scenario offer projection
             
         Returns:
-            Dictionary with impact metrics
+            ScenarioImpact with impact metrics; use to_dict() for the
+            dictionary form
         """
-        base_total = sum(year.total for year in base_projection.years)
-        scenario_total = sum(year.total for year in scenario_projection.years)
+        base_totals = _yearly_totals(base_projection)
+        scenario_totals = _yearly_totals(scenario_projection)
         
-        total_difference = scenario_total - base_total
+        base_total = float(base_totals.sum())
+        total_difference = float(scenario_totals.sum()) - base_total
         percentage_change = (total_difference / base_total * 100) if base_total > 0 else 0
         
-        # Calculate year-by-year differences
-        yearly_differences = []
-        for base_year, scenario_year in zip(base_projection.years, scenario_projection.years):
-            yearly_differences.append({
-                "year": base_year.year,
-                "difference": scenario_year.total - base_year.total,
-                "percentage_change": (
-                    (scenario_year.total - base_year.total) / base_year.total * 100
-                ) if base_year.total > 0 else 0
-            })
+        # Calculate year-by-year differences over the overlapping years, writing
+        # the percentages into a single buffer rather than chained temporaries
+        n_years = min(len(base_totals), len(scenario_totals))
+        overlap_totals = base_totals[:n_years]
+        differences = scenario_totals[:n_years] - overlap_totals
+        percentages = np.zeros(n_years, dtype=np.float64)
+        np.divide(differences, overlap_totals, out=percentages, where=overlap_totals > 0)
+        percentages *= 100
         
-        return {
-            "total_difference": total_difference,
-            "percentage_change": percentage_change,
-            "yearly_differences": yearly_differences,
-            "scenario_name": scenario_projection.offer_name
-        } 
\ No newline at end of file
+        return ScenarioImpact(
+            total_difference=total_difference,
+            percentage_change=percentage_change,
+            years=np.array([year.year for year in base_projection.years[:n_years]]),
+            yearly_differences=differences,
+            yearly_pct_change=percentages,
+            scenario_name=scenario_projection.offer_name
+        ) 
\ No newline at end of file
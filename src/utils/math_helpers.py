@@ -1,6 +1,8 @@
+import math
 import numpy as np
-from datetime import date, datetime
-from typing import List, Tuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 
 
 def calculate_cagr(initial_value: float, final_value: float, years: float) -> float:
@@ -12,14 +14,149 @@ def calculate_cagr(initial_value: float, final_value: float, years: float) -> fl
 
 def calculate_future_value(initial_value: float, growth_rate: float, years: float) -> float:
     """Calculate future value with compound growth"""
-    return initial_value * (1 + growth_rate) ** years
+    growth_factor = 1.0 + growth_rate
+    
+    # Whole-year horizons are short, so a few multiplications beat pow
+    if isinstance(years, int) and 0 <= years <= 10:
+        multiplier = 1.0
+        for _ in range(years):
+            multiplier *= growth_factor
+        return initial_value * multiplier
+    
+    return initial_value * math.pow(growth_factor, years)
+
+
+@lru_cache(maxsize=256)
+def growth_table(growth_rate: float, offset_months: int, years: int) -> np.ndarray:
+    """
+    Compound growth multipliers at each yearly anniversary of a grant
+    
+    Args:
+        growth_rate: Annual growth rate
+        offset_months: Months from the grant start to the first anniversary
+        years: Number of years to project
+    
+    Returns:
+        Read-only array of (1 + growth_rate) ** (months / 12), indexed by year - 1
+    """
+    months = offset_months + 12 * np.arange(years)
+    table = (1 + growth_rate) ** (months / 12)
+    table.setflags(write=False)
+    return table
+
+
+def month_ordinal(d: date) -> int:
+    """Convert a date to a month count so month differences are plain subtraction"""
+    return d.year * 12 + d.month - 1
+
+
+@lru_cache(maxsize=4096)
+def shifted_month_ordinal(d: date, offset_days: int) -> int:
+    """Month ordinal of a date moved by offset_days, shared across scenarios"""
+    return month_ordinal(d + timedelta(days=offset_days))
 
 
-def months_between_dates(start_date: date, end_date: date) -> int:
-    """Calculate number of months between two dates"""
+def months_between_dates(
+    start_date: Union[date, int], end_date: Union[date, int]
+) -> int:
+    """Calculate number of months between two dates or month ordinals"""
+    if isinstance(start_date, int):
+        return end_date - start_date
     return (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
 
 
+def project_cash_compensation(
+    base_salary: float,
+    signing_bonus: float,
+    bonus_fixed: float,
+    bonus_percentage: float,
+    years: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project base salary and bonus for each year
+    
+    Args:
+        base_salary: Annual base salary (constant across years)
+        signing_bonus: One-time signing bonus paid in year 1
+        bonus_fixed: Fixed annual bonus amount
+        bonus_percentage: Annual bonus as percentage of base salary
+        years: Number of years to project
+    
+    Returns:
+        Tuple of (base, bonus) arrays indexed by year - 1
+    """
+    # A non-positive horizon projects no years, like an empty range
+    years = max(years, 0)
+    base = np.full(years, base_salary, dtype=np.float64)
+    
+    # Base salary is constant, so the recurring bonus is computed once and
+    # broadcast; the signing bonus is only paid in the first year
+    bonus = np.full(years, bonus_fixed + base_salary * bonus_percentage / 100, dtype=np.float64)
+    if years > 0:
+        bonus[0] += signing_bonus
+    
+    return base, bonus
+
+
+# Months per vesting period for each vesting frequency
+FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3, "annually": 12}
+
+
+def vesting_fraction(
+    months_since_vesting: int,
+    cliff_months: int,
+    duration_months: int,
+    frequency_months: int,
+) -> float:
+    """
+    Fraction of a grant vested after a whole number of months
+    
+    Args:
+        months_since_vesting: Months elapsed since vesting started
+        cliff_months: Cliff period in months
+        duration_months: Total vesting duration in months
+        frequency_months: Months per vesting period from FREQUENCY_MONTHS
+    
+    Returns:
+        Vested fraction between 0.0 and 1.0
+    """
+    # If before cliff, no vesting
+    if months_since_vesting < cliff_months:
+        return 0.0
+    
+    # Calculate vesting percentage
+    if months_since_vesting >= duration_months:
+        vesting_percentage = 1.0
+    else:
+        vesting_percentage = months_since_vesting / duration_months
+    
+    # Round down to whole vesting periods. Monthly vesting is already whole
+    # since months are integers, and rounding it again could lose an ulp
+    if frequency_months > 1:
+        periods = duration_months / frequency_months
+        vesting_percentage = math.floor(vesting_percentage * periods) / periods
+    
+    return vesting_percentage
+
+
+def vested_amount_from_months(
+    total_grant_value: float,
+    months_since_vesting: int,
+    cliff_months: int,
+    duration_months: int,
+    frequency_months: int,
+    growth_multiplier: float = 1.0,
+) -> float:
+    """Vested equity value from precomputed month offsets and growth factor"""
+    if months_since_vesting < cliff_months:
+        return 0.0
+    
+    vested_value = total_grant_value * vesting_fraction(
+        months_since_vesting, cliff_months, duration_months, frequency_months
+    )
+    return max(0.0, vested_value * growth_multiplier)
+
+
 def calculate_vested_amount(
     total_grant_value: float,
     grant_start_date: date,
@@ -29,6 +166,7 @@ def calculate_vested_amount(
     frequency: str,
     current_date: date,
     growth_rate: float = 0.0,
+    growth_multiplier: Optional[float] = None,
 ) -> float:
     """
     Calculate vested equity amount based on vesting schedule
@@ -42,45 +180,29 @@ def calculate_vested_amount(
         frequency: Vesting frequency ('monthly', 'quarterly', 'annually')
         current_date: Date to calculate vesting for
         growth_rate: Annual growth rate for equity value
+        growth_multiplier: Precomputed growth factor for current_date, used
+            instead of compounding growth_rate
     
     Returns:
         Vested equity value in USD
     """
-    # Calculate months since vesting started
+    # Convert dates to month offsets once; the numeric work happens on ints
     months_since_vesting = months_between_dates(vesting_start_date, current_date)
     
-    # If before cliff, no vesting
-    if months_since_vesting < cliff_months:
-        return 0.0
-    
-    # Calculate vesting percentage
-    if months_since_vesting >= duration_months:
-        vesting_percentage = 1.0
-    else:
-        vesting_percentage = months_since_vesting / duration_months
+    if growth_multiplier is None:
+        growth_multiplier = 1.0
+        if growth_rate > 0:
+            years_since_grant = months_between_dates(grant_start_date, current_date) / 12
+            growth_multiplier = calculate_future_value(1.0, growth_rate, years_since_grant)
     
-    # Apply frequency adjustments
-    if frequency == "monthly":
-        # Monthly vesting is already handled by the percentage calculation
-        pass
-    elif frequency == "quarterly":
-        # Quarterly vesting - round down to nearest quarter
-        quarters_vested = int(vesting_percentage * (duration_months / 3))
-        vesting_percentage = quarters_vested / (duration_months / 3)
-    elif frequency == "annually":
-        # Annual vesting - round down to nearest year
-        years_vested = int(vesting_percentage * (duration_months / 12))
-        vesting_percentage = years_vested / (duration_months / 12)
-    
-    # Calculate vested value
-    vested_value = total_grant_value * vesting_percentage
-    
-    # Apply growth rate if specified
-    if growth_rate > 0:
-        years_since_grant = months_between_dates(grant_start_date, current_date) / 12
-        vested_value = calculate_future_value(vested_value, growth_rate, years_since_grant)
-    
-    return max(0.0, vested_value)
+    return vested_amount_from_months(
+        total_grant_value,
+        months_since_vesting,
+        cliff_months,
+        duration_months,
+        FREQUENCY_MONTHS.get(frequency, 1),
+        growth_multiplier,
+    )
 
 
 def calculate_refresh_grant(
@@ -11,10 +11,15 @@ from datetime import date
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# Reuse one pooled connection across all requests
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 def test_health():
     """Test health endpoint"""
     print("🔍 Testing health endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     print()
@@ -22,7 +27,7 @@ def test_health():
 def test_benchmarks():
     """Test benchmarks endpoint"""
     print("🔍 Testing benchmarks endpoint...")
-    response = requests.get(f"{BASE_URL}/benchmarks/")
+    response = SESSION.get(f"{BASE_URL}/benchmarks/")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         data = response.json()
@@ -88,7 +93,7 @@ def test_compare_offers():
         "projection_years": 4
     }
     
-    response = requests.post(f"{BASE_URL}/compare/", json=payload)
+    response = SESSION.post(f"{BASE_URL}/compare/", json=payload)
     print(f"Status: {response.status_code}")
     
     if response.status_code == 200:
@@ -136,7 +141,7 @@ def test_scenario():
         "projection_years": 4
     }
     
-    response = requests.post(f"{BASE_URL}/scenario/", json=payload)
+    response = SESSION.post(f"{BASE_URL}/scenario/", json=payload)
     print(f"Exit scenario status: {response.status_code}")
     
     if response.status_code == 200:
@@ -0,0 +1,80 @@
+"""
+Tests for ScenarioService.compare_scenarios
+
+compare_scenarios projects every scenario in one equity matrix, so each of
+its rows must match the projection of the matching simulate_* method.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.models.compensation import CompensationOffer
+from src.services.scenario_service import ScenarioService
+
+
+def make_offer() -> CompensationOffer:
+    """Offer with two grants that use different growth and refresh settings"""
+    return CompensationOffer(
+        offer_name="Test Offer",
+        base_salary=180000,
+        signing_bonus=25000,
+        bonus_percentage=15,
+        bonus_fixed=5000,
+        start_date=date(2024, 3, 1),
+        equity_grants=[
+            {
+                "type": "RSU",
+                "value": 400000,
+                "vesting_schedule": {
+                    "cliff_months": 12,
+                    "duration_months": 48,
+                    "frequency": "quarterly"
+                },
+                "start_date": date(2024, 3, 1),
+                "refresh_rate": 10,
+                "growth_rate": 0.1
+            },
+            {
+                "type": "option",
+                "value": 120000,
+                "vesting_schedule": {
+                    "cliff_months": 6,
+                    "duration_months": 36,
+                    "frequency": "monthly"
+                },
+                "start_date": date(2023, 9, 15),
+                "growth_rate": 0.0
+            }
+        ]
+    )
+
+
+@pytest.mark.parametrize("years", [1, 4, 7])
+def test_compare_scenarios_rows_match_simulations(years):
+    service = ScenarioService()
+    offer = make_offer()
+    new_start_date = date(2024, 11, 20)
+
+    scenarios = [
+        {"type": "start_date", "new_start_date": new_start_date},
+        {"type": "exit", "exit_valuation": 2500000000, "exit_year": 3},
+        {"type": "growth_rate", "growth_rate": 0.25},
+        {"type": "growth_rate", "growth_rate": -1.5},
+        {"type": "refresh_rate", "refresh_rate": 20},
+        {"type": "unknown"}
+    ]
+    expected = [
+        service.compensation_service.compute_total_comp(offer, years),
+        service.simulate_start_date_offset(offer, new_start_date, years),
+        service.simulate_exit(offer, 2500000000, 3, years),
+        service.simulate_growth_rate_change(offer, 0.25, years),
+        service.simulate_growth_rate_change(offer, -1.5, years),
+        service.simulate_refresh_rate_change(offer, 20, years)
+    ]
+
+    projections = service.compare_scenarios(offer, scenarios, years)
+
+    assert len(projections) == len(expected)
+    for projection, simulated in zip(projections, expected):
+        assert projection.years == simulated.years